@@ -5,17 +5,35 @@ Author: Jose Diaz
 Description: Automated diagnostics and troubleshooting for Cisco devices
 """
 
-import sys
+import os
+import re
 import json
+import time
+import argparse
+import asyncio
 import datetime
-from typing import Dict, List, Optional
+import importlib
+import importlib.util
+import logging
+import logging.handlers
+import threading
+import warnings
+from typing import Any, Dict, List, Literal, Optional, TypedDict, Union
 from netmiko import ConnectHandler
 from netmiko.exceptions import NetmikoTimeoutException, NetmikoAuthenticationException
 
+# orjson is optional - it serializes large reports several times faster
+# than the stdlib encoder, but the toolkit works without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Default configuration (used if config.py doesn't exist)
 DEFAULT_DEVICE_TYPE = 'cisco_ios'
 DEFAULT_TIMEOUT = 30
 DEFAULT_PORT = 22
+FAST_CLI_DEFAULT = True
 DIAGNOSTIC_COMMANDS = [
     'show version',
     'show ip interface brief',
@@ -26,38 +44,310 @@ DIAGNOSTIC_COMMANDS = [
 ]
 REPORT_FORMAT = 'text'
 TIMESTAMP_FORMAT = '%Y-%m-%d_%H-%M-%S'
+MAX_CONCURRENT_DEVICES = 32
 
-# Import configuration
-# Import configuration
-try:
-    from config import (
-        DEFAULT_DEVICE_TYPE, DEFAULT_TIMEOUT, DEFAULT_PORT,
-        DIAGNOSTIC_COMMANDS, REPORT_FORMAT, TIMESTAMP_FORMAT
+# Connection pool settings
+POOL_IDLE_TIMEOUT = 300   # seconds a cached connection may sit unused
+POOL_MAX_AGE = 3600       # seconds before a cached connection is retired
+POOL_MAX_SIZE = 100       # maximum number of cached connections
+POOL_SWEEP_INTERVAL = 60  # seconds between eviction sweeps
+KEEPALIVE_INTERVAL = 30   # seconds between SSH keepalives on pooled sessions
+
+# Commands whose output is static for the life of a session - cached per
+# pooled connection and served without a round-trip on repeat runs
+STATIC_FACTS_COMMANDS = ('show version', 'show inventory')
+
+# Pre-compiled health-check parsers (compiled once, reused on every call)
+CPU_5MIN_RE = re.compile(r'five minutes:\s*(\d+)%', re.ASCII)
+MEM_FREE_RE = re.compile(r'Processor\s+\S+\s+\d+\s+\d+\s+(\d+)', re.ASCII)
+IFACE_DOWN_RE = re.compile(r'^\S+.*\sdown\s+down\s*$', re.ASCII | re.MULTILINE)
+
+# Matches commands with a simple include/exclude pipe filter
+PIPE_FILTER_RE = re.compile(r'^(?P<base>[^|]+?)\s*\|\s*(?P<action>include|exclude)\s+(?P<pattern>.+)$')
+
+logger = logging.getLogger("cisco_troubleshooter")
+
+
+def configure_logging(level: int = logging.INFO, buffered: bool = False):
+    """
+    Configure toolkit logging output
+
+    Args:
+        level: Minimum level to emit (default: logging.INFO)
+        buffered: Batch records in a MemoryHandler and flush in chunks
+            instead of hitting the stream per message (useful for bulk
+            runs where hundreds of per-device messages would otherwise
+            each flush stdout)
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    if buffered:
+        handler = logging.handlers.MemoryHandler(
+            capacity=1024, target=handler, flushLevel=logging.ERROR)
+    logger.handlers.clear()
+    logger.addHandler(handler)
+    logger.setLevel(level)
+
+# Import configuration - probe for config.py instead of catching
+# ImportError, so re-imports in worker processes skip the exception
+# raise/unwind machinery and missing settings fall back to the defaults
+_CONFIG_SETTINGS = (
+    'DEFAULT_DEVICE_TYPE', 'DEFAULT_TIMEOUT', 'DEFAULT_PORT', 'FAST_CLI_DEFAULT',
+    'DIAGNOSTIC_COMMANDS', 'REPORT_FORMAT', 'TIMESTAMP_FORMAT',
+)
+if importlib.util.find_spec('config'):
+    _config = importlib.import_module('config')
+    globals().update({
+        name: getattr(_config, name)
+        for name in _CONFIG_SETTINGS if hasattr(_config, name)
+    })
+else:
+    warnings.warn(
+        "config.py not found - using built-in defaults. "
+        "Copy config_example.py to config.py to customize settings."
     )
-except ImportError:
-    print("Error: config.py not found. Please copy config_example.py to config.py")
-    sys.exit(1)
-except AttributeError:
-    print("Error: config.py is empty or missing required settings.")
-    print("Please copy the contents of config_example.py to config.py and update with your settings.")
-    sys.exit(1)
+
+
+def _canonicalize(commands: List[str]):
+    """
+    Dedupe a command list and fold filtered variants into their base command
+
+    Exact duplicates are dropped (order-preserving). When both a command
+    and an include/exclude-filtered variant of it are requested (e.g.
+    'show processes cpu' and 'show processes cpu | include CPU'), only the
+    unfiltered form is sent to the device and the filtered output is
+    synthesized locally - one fewer round-trip per folded command.
+
+    Args:
+        commands: Requested command list
+
+    Returns:
+        tuple: (commands to send, {folded command: (base, action, pattern)})
+    """
+    commands = list(dict.fromkeys(commands))
+    present = set(commands)
+    to_run = []
+    synthesized = {}
+    for cmd in commands:
+        match = PIPE_FILTER_RE.match(cmd)
+        if match:
+            base = match.group('base').strip()
+            pattern = match.group('pattern').strip()
+            # Only fold patterns that mean the same thing in both regex
+            # dialects: IOS '_' matches delimiters (not a literal
+            # underscore) and '|' chains another filter stage, so those
+            # must run on the device
+            if base in present and '|' not in pattern and '_' not in pattern:
+                synthesized[cmd] = (base, match.group('action'), pattern)
+                continue
+        to_run.append(cmd)
+    return to_run, synthesized
+
+
+def _apply_filter(output: str, action: str, pattern: str) -> str:
+    """
+    Apply an include/exclude pipe filter to already-captured output
+
+    Args:
+        output: Unfiltered command output
+        action: 'include' or 'exclude'
+        pattern: The filter regex; _canonicalize only folds patterns free
+            of IOS-specific syntax ('_' delimiters, chained '|' stages),
+            anything else runs on the device
+
+    Returns:
+        str: The lines the device-side filter would have produced
+    """
+    regex = re.compile(pattern)
+    lines = output.splitlines()
+    if action == 'include':
+        return '\n'.join(line for line in lines if regex.search(line))
+    return '\n'.join(line for line in lines if not regex.search(line))
+
+
+class _ErrorResultBase(TypedDict):
+    error: str
+
+
+class ErrorResult(_ErrorResultBase, total=False):
+    """Error shape returned when a device cannot be reached"""
+    device: str
+
+
+class DiagnosticsResult(TypedDict):
+    """Result shape returned by run_diagnostics"""
+    device: str
+    hostname: str
+    timestamp: str
+    diagnostics: Dict[str, Any]
+
+
+class HealthResult(TypedDict):
+    """Result shape returned by check_health"""
+    device: str
+    hostname: str
+    status: Literal['healthy', 'warning', 'critical']
+    issues: List[str]
+
+
+class ConnectionPool:
+    """Thread-safe cache of live Netmiko connections
+
+    Connections are keyed by (ip, port, username, device_type) so repeated
+    runs against the same device reuse the established SSH session instead
+    of paying the full handshake and authentication cost each time. Idle
+    and aged-out connections are closed by a background sweep.
+    """
+
+    def __init__(self, idle_timeout: int = POOL_IDLE_TIMEOUT,
+                 max_age: int = POOL_MAX_AGE,
+                 max_size: int = POOL_MAX_SIZE):
+        self.idle_timeout = idle_timeout
+        self.max_age = max_age
+        self.max_size = max_size
+        self._entries = {}  # key -> (connection, last_used, created)
+        self._lock = threading.RLock()
+        self._sweeper = None
+
+    @staticmethod
+    def _key(device: Dict) -> tuple:
+        return (device['ip'], device['port'],
+                device['username'], device['device_type'])
+
+    def acquire(self, device: Dict):
+        """
+        Return a live connection for the device, reusing a cached one if possible
+
+        Args:
+            device: Netmiko device parameter dict
+
+        Returns:
+            An established Netmiko connection
+        """
+        with self._lock:
+            entry = self._entries.pop(self._key(device), None)
+
+        if entry:
+            connection, last_used, created = entry
+            if time.time() - created < self.max_age:
+                try:
+                    if connection.is_alive():
+                        return connection
+                except Exception:
+                    pass
+            self._close(connection)
+
+        connection = ConnectHandler(**device)
+        connection._pool_created = time.time()
+        # Fresh session, fresh facts cache - a reboot drops the old session,
+        # so stale facts cannot survive it
+        connection._pool_facts = {}
+        self._enable_keepalive(connection)
+        return connection
+
+    @staticmethod
+    def _enable_keepalive(connection):
+        """Send SSH keepalives so cached sessions survive idle periods
+
+        Without keepalives, firewalls and device exec-timeouts tear down
+        idle sessions between pool hits, forcing a full reconnect anyway.
+        """
+        try:
+            transport = connection.remote_conn.get_transport()
+            transport.set_keepalive(KEEPALIVE_INTERVAL)
+        except AttributeError:
+            pass  # non-paramiko transport (e.g. telnet)
+
+    def release(self, device: Dict, connection):
+        """
+        Return a connection to the pool for later reuse
+
+        Args:
+            device: Netmiko device parameter dict
+            connection: The connection obtained from acquire()
+        """
+        if connection is None:
+            return
+
+        created = getattr(connection, '_pool_created', time.time())
+        key = self._key(device)
+        with self._lock:
+            if key in self._entries or len(self._entries) >= self.max_size:
+                # The slot is already occupied by a cached session (or the
+                # pool is full) - close this connection rather than
+                # overwriting the cached one and leaking its socket
+                self._close(connection)
+                return
+            self._entries[key] = (connection, time.time(), created)
+            self._schedule_sweep()
+
+    def close_all(self):
+        """Close every cached connection and empty the pool"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for connection, _, _ in entries:
+            self._close(connection)
+
+    def _schedule_sweep(self):
+        if self._sweeper is None or not self._sweeper.is_alive():
+            self._sweeper = threading.Timer(POOL_SWEEP_INTERVAL, self._sweep)
+            self._sweeper.daemon = True
+            self._sweeper.start()
+
+    def _sweep(self):
+        """Evict connections that have been idle or alive too long"""
+        now = time.time()
+        with self._lock:
+            expired = [
+                key for key, (_, last_used, created) in self._entries.items()
+                if now - last_used > self.idle_timeout or now - created > self.max_age
+            ]
+            closing = [self._entries.pop(key)[0] for key in expired]
+            if self._entries:
+                self._schedule_sweep()
+        for connection in closing:
+            self._close(connection)
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.disconnect()
+        except Exception:
+            pass
+
+
+# Shared pool used by all CiscoTroubleshooter instances
+pool = ConnectionPool()
 
 
 class CiscoTroubleshooter:
     """Main class for Cisco device troubleshooting and diagnostics"""
-    
-    def __init__(self, ip: str, username: str, password: str, 
+
+    # No per-instance __dict__: bulk runs can keep thousands of these alive
+    __slots__ = ('device', 'reuse_connection', 'connection', 'hostname',
+                 '_prompt_re', '_run_timestamp', '_last_diagnostics')
+
+
+    def __init__(self, ip: str, username: str, password: str,
                  device_type: str = DEFAULT_DEVICE_TYPE,
-                 port: int = DEFAULT_PORT):
+                 port: int = DEFAULT_PORT,
+                 fast_cli: bool = FAST_CLI_DEFAULT,
+                 reuse_connection: bool = True):
         """
         Initialize the troubleshooter with device credentials
-        
+
         Args:
             ip: Device IP address
             username: Login username
             password: Login password
             device_type: Netmiko device type (default: cisco_ios)
             port: SSH port (default: 22)
+            fast_cli: Use Netmiko's reduced read delays (default: True;
+                pass False for very slow devices or links)
+            reuse_connection: Cache the SSH session in the shared pool on
+                disconnect so later runs skip the handshake (default: True;
+                pass False to always tear the session down)
         """
         self.device = {
             'device_type': device_type,
@@ -66,9 +356,19 @@ class CiscoTroubleshooter:
             'password': password,
             'port': port,
             'timeout': DEFAULT_TIMEOUT,
+            # fast_cli drops Netmiko's conservative per-command sleeps so
+            # send_command returns as soon as the prompt pattern matches
+            'fast_cli': fast_cli,
+            'conn_timeout': 10,
+            'banner_timeout': 15,
+            'auth_timeout': 15,
         }
+        self.reuse_connection = reuse_connection
         self.connection = None
         self.hostname = None
+        self._prompt_re = None
+        self._run_timestamp = None
+        self._last_diagnostics = None
         
     def connect(self) -> bool:
         """
@@ -78,118 +378,265 @@ class CiscoTroubleshooter:
             bool: True if connection successful, False otherwise
         """
         try:
-            print(f"Connecting to {self.device['ip']}...")
-            self.connection = ConnectHandler(**self.device)
+            logger.info("Connecting to %s...", self.device['ip'])
+            if self.reuse_connection:
+                self.connection = pool.acquire(self.device)
+            else:
+                self.connection = ConnectHandler(**self.device)
             self.hostname = self.connection.find_prompt()[:-1]
-            print(f"Successfully connected to {self.hostname}")
+            # Cache the prompt pattern so each command can match against it
+            # directly instead of re-discovering the prompt every call
+            self._prompt_re = re.compile(re.escape(self.hostname) + r'[>#]\s*$')
+            logger.info("Successfully connected to %s", self.hostname)
             return True
         except NetmikoAuthenticationException:
-            print(f"Authentication failed for {self.device['ip']}")
+            logger.error("Authentication failed for %s", self.device['ip'])
             return False
         except NetmikoTimeoutException:
-            print(f"Connection timeout for {self.device['ip']}")
+            logger.error("Connection timeout for %s", self.device['ip'])
             return False
         except Exception as e:
-            print(f"Connection error: {str(e)}")
+            logger.error("Connection error: %s", e)
             return False
     
     def disconnect(self):
-        """Safely disconnect from the device"""
+        """Release the connection back to the pool (or close it outright)"""
         if self.connection:
-            self.connection.disconnect()
-            print(f"Disconnected from {self.hostname}")
+            if self.reuse_connection:
+                pool.release(self.device, self.connection)
+            else:
+                self.connection.disconnect()
+            self.connection = None
+            logger.info("Disconnected from %s", self.hostname)
     
-    def run_command(self, command: str) -> str:
+    def run_command(self, command: str, structured: bool = False):
         """
         Execute a single command on the device
-        
+
         Args:
             command: Command to execute
-            
+            structured: Parse the output into structured data with TextFSM
+                (requires an ntc-templates match; returns raw text otherwise)
+
         Returns:
-            str: Command output
+            str: Command output, or a list of dicts when structured parsing
+            succeeds
         """
         if not self.connection:
             return "Error: Not connected to device"
-        
+
         try:
-            output = self.connection.send_command(command)
-            return output
+            if structured or self._prompt_re is None:
+                # Structured parsing needs Netmiko's own stripping before
+                # the output reaches TextFSM
+                return self.connection.send_command(command, use_textfsm=structured)
+
+            output = self.connection.send_command(
+                command,
+                expect_string=self._prompt_re.pattern,
+                strip_prompt=False,
+                strip_command=False,
+            )
+            # Strip the echoed command and trailing prompt with the cached
+            # pattern - one substitution instead of Netmiko's per-call scans
+            if output.startswith(command):
+                output = output[len(command):]
+            return self._prompt_re.sub('', output).strip('\n')
         except Exception as e:
             return f"Error executing command: {str(e)}"
     
-    def run_diagnostics(self, commands: List[str] = None) -> Dict[str, str]:
+    def _run_commands_batch(self, commands: List[str]) -> Dict[str, str]:
+        """
+        Send all commands in a single multiline exchange and split the output
+
+        Avoids a separate send/prompt-detection round-trip per command by
+        pushing the whole command list in one go, then carving the combined
+        output back up on prompt boundaries.
+
+        Args:
+            commands: List of commands to send
+
+        Returns:
+            dict: Command outputs keyed by command
+        """
+        combined = self.connection.send_multiline(commands)
+
+        # Each chunk starts with the echoed command it belongs to. The
+        # prompt must sit at the start of a line so prompt-like strings
+        # inside command output (e.g. logged exec commands in
+        # 'show logging') don't split a chunk mid-output
+        prompt_split_re = re.compile(
+            r'^' + re.escape(self.hostname) + r'[>#][ \t]*', re.MULTILINE)
+        chunks = prompt_split_re.split(combined)
+        command_set = set(commands)
+        outputs = {}
+        for chunk in chunks:
+            # Match the echoed command line exactly - a prefix test would
+            # credit 'show interfaces status' output to 'show interfaces'
+            echoed, _, body = chunk.partition('\n')
+            cmd = echoed.strip()
+            if cmd in command_set:
+                outputs[cmd] = body.strip('\n')
+        return outputs
+
+    def run_diagnostics(self, commands: List[str] = None) -> Union[DiagnosticsResult, ErrorResult]:
         """
         Run diagnostic commands on the device
-        
+
         Args:
             commands: List of commands to run (uses default if None)
-            
+
         Returns:
-            dict: Command outputs keyed by command
+            DiagnosticsResult: Command outputs keyed by command (an
+            ErrorResult if the device cannot be reached)
         """
         if not self.connection:
             if not self.connect():
                 return {"error": "Failed to connect to device"}
-        
+
         commands = commands or DIAGNOSTIC_COMMANDS
+        # Stamp the run once; reports and JSON exports reuse this value
+        self._run_timestamp = datetime.datetime.now().strftime(TIMESTAMP_FORMAT)
         results = {
             'device': self.device['ip'],
             'hostname': self.hostname,
-            'timestamp': datetime.datetime.now().strftime(TIMESTAMP_FORMAT),
+            'timestamp': self._run_timestamp,
             'diagnostics': {}
         }
-        
-        print(f"\nRunning diagnostics on {self.hostname}...")
-        for cmd in commands:
-            print(f"  Executing: {cmd}")
-            output = self.run_command(cmd)
-            results['diagnostics'][cmd] = output
-            
+
+        # Send each unique command once; filtered variants whose base
+        # command is also requested are reconstructed locally
+        to_run, synthesized = _canonicalize(commands)
+
+        # Serve static facts (show version / show inventory) from the
+        # connection's cache instead of re-running them every cycle
+        facts = getattr(self.connection, '_pool_facts', None)
+        collected = {}
+        if facts:
+            for cmd in STATIC_FACTS_COMMANDS:
+                if cmd in to_run and cmd in facts:
+                    collected[cmd] = facts[cmd]
+            to_run = [cmd for cmd in to_run if cmd not in collected]
+
+        logger.info("Running diagnostics on %s...", self.hostname)
+        try:
+            outputs = self._run_commands_batch(to_run)
+        except Exception:
+            outputs = {}
+        for cmd in to_run:
+            if cmd in outputs:
+                collected[cmd] = outputs[cmd]
+            else:
+                # Fall back to one command per round-trip if the batch
+                # output could not be split cleanly
+                logger.debug("Executing: %s", cmd)
+                collected[cmd] = self.run_command(cmd)
+
+        for cmd, (base, action, pattern) in synthesized.items():
+            base_output = collected.get(base)
+            if isinstance(base_output, str):
+                try:
+                    collected[cmd] = _apply_filter(base_output, action, pattern)
+                    continue
+                except re.error:
+                    # IOS filter syntax that isn't a valid Python regex -
+                    # let the device apply the filter instead
+                    pass
+            collected[cmd] = self.run_command(cmd)
+
+        if facts is not None:
+            for cmd in STATIC_FACTS_COMMANDS:
+                output = collected.get(cmd)
+                if cmd not in facts and isinstance(output, str) \
+                        and not output.startswith('Error'):
+                    facts[cmd] = output
+
+        # Preserve the requested command order in the results
+        results['diagnostics'] = {cmd: collected[cmd] for cmd in dict.fromkeys(commands)}
+
+        # Keep the outputs so check_health can parse them without
+        # re-querying the device
+        self._last_diagnostics = results['diagnostics']
+
         return results
     
-    def check_health(self) -> Dict[str, any]:
+    @staticmethod
+    def _cached_output(diagnostics: Dict[str, str], base_command: str) -> Optional[str]:
+        """
+        Find cached output for a command, accepting filtered variants
+
+        Args:
+            diagnostics: Command outputs keyed by command
+            base_command: The command head to look for (pipe filters on the
+                cached key are fine - the filtered output still contains
+                the lines the health checks parse)
+
+        Returns:
+            str: Cached output, or None if the command was not run
+        """
+        for cmd, output in diagnostics.items():
+            if cmd == base_command or cmd.startswith(base_command + ' |'):
+                if isinstance(output, str):
+                    return output
+        return None
+
+    def check_health(self, diagnostics: Dict[str, str] = None) -> Union[HealthResult, ErrorResult]:
         """
         Perform quick health check on the device
-        
+
+        Args:
+            diagnostics: Previously collected command outputs to parse
+                instead of re-querying the device (defaults to the outputs
+                of the last run_diagnostics call, if any)
+
         Returns:
-            dict: Health status indicators
+            HealthResult: Health status indicators (an ErrorResult if the
+            device cannot be reached)
         """
-        if not self.connection:
-            if not self.connect():
-                return {"error": "Failed to connect to device"}
-        
+        diagnostics = diagnostics or self._last_diagnostics or {}
+
+        # Only touch the wire for data the cached diagnostics don't cover
+        needed = ('show processes cpu', 'show memory statistics',
+                  'show ip interface brief')
+        if any(self._cached_output(diagnostics, cmd) is None for cmd in needed):
+            if not self.connection:
+                if not self.connect():
+                    return {"error": "Failed to connect to device"}
+
         health = {
             'device': self.device['ip'],
-            'hostname': self.hostname,
+            # Cached-only calls may never connect, leaving hostname unset
+            'hostname': self.hostname or self.device['ip'],
             'status': 'healthy',
             'issues': []
         }
         
         # Check CPU usage
-        cpu_output = self.run_command('show processes cpu | include CPU')
+        cpu_output = self._cached_output(diagnostics, 'show processes cpu') or \
+            self.run_command('show processes cpu | include CPU')
         if "Error" not in cpu_output:
-            # Parse CPU usage (this is simplified - adjust based on actual output)
-            lines = cpu_output.strip().split('\n')
-            for line in lines:
-                if 'five minutes:' in line:
-                    cpu_5min = int(line.split('five minutes:')[1].split('%')[0])
-                    if cpu_5min > 80:
-                        health['issues'].append(f"High CPU usage: {cpu_5min}%")
-                        health['status'] = 'warning'
-        
+            match = CPU_5MIN_RE.search(cpu_output)
+            if match:
+                cpu_5min = int(match.group(1))
+                if cpu_5min > 80:
+                    health['issues'].append(f"High CPU usage: {cpu_5min}%")
+                    health['status'] = 'warning'
+
         # Check memory
-        mem_output = self.run_command('show memory statistics | include Processor')
-        if "Error" not in mem_output and "Free" in mem_output:
-            # Parse memory (simplified)
-            if int(mem_output.split()[-1]) < 10000000:  # Less than 10MB free
+        mem_output = self._cached_output(diagnostics, 'show memory statistics') or \
+            self.run_command('show memory statistics | include Processor')
+        if "Error" not in mem_output:
+            match = MEM_FREE_RE.search(mem_output)
+            if match and int(match.group(1)) < 10000000:  # Less than 10MB free
                 health['issues'].append("Low memory")
                 health['status'] = 'warning'
-        
+
         # Check interfaces
-        int_output = self.run_command('show ip interface brief | include down')
-        if "Error" not in int_output and int_output.strip():
-            down_count = len(int_output.strip().split('\n'))
+        int_output = self._cached_output(diagnostics, 'show ip interface brief') or \
+            self.run_command('show ip interface brief | include down')
+        if "Error" not in int_output:
+            # Count matches lazily - no intermediate list of matched lines
+            down_count = sum(1 for _ in IFACE_DOWN_RE.finditer(int_output))
             if down_count > 0:
                 health['issues'].append(f"{down_count} interfaces down")
         
@@ -207,33 +654,47 @@ class CiscoTroubleshooter:
             filename: Output filename (auto-generated if None)
         """
         if not filename:
-            timestamp = datetime.datetime.now().strftime(TIMESTAMP_FORMAT)
+            timestamp = results.get('timestamp') or \
+                datetime.datetime.now().strftime(TIMESTAMP_FORMAT)
             hostname = results.get('hostname', 'unknown')
             filename = f"cisco_report_{hostname}_{timestamp}.txt"
         
         try:
-            with open(filename, 'w') as f:
-                # Header
-                f.write("=" * 80 + "\n")
-                f.write(f"Cisco Diagnostic Report\n")
-                f.write(f"Device: {results.get('device', 'Unknown')}\n")
-                f.write(f"Hostname: {results.get('hostname', 'Unknown')}\n")
-                f.write(f"Generated: {results.get('timestamp', 'Unknown')}\n")
-                f.write("=" * 80 + "\n\n")
-                
-                # Diagnostic outputs
-                diagnostics = results.get('diagnostics', {})
-                for cmd, output in diagnostics.items():
-                    f.write(f"\n{'#' * 60}\n")
-                    f.write(f"# Command: {cmd}\n")
-                    f.write(f"{'#' * 60}\n\n")
-                    f.write(output)
-                    f.write("\n\n")
-                    
-            print(f"Report saved to: {filename}")
-            
+            # Assemble the whole report in memory and emit a single write
+            # instead of several small writes per command
+            parts = [
+                "=" * 80 + "\n",
+                "Cisco Diagnostic Report\n",
+                f"Device: {results.get('device', 'Unknown')}\n",
+                f"Hostname: {results.get('hostname', 'Unknown')}\n",
+                f"Generated: {results.get('timestamp', 'Unknown')}\n",
+                "=" * 80 + "\n\n",
+            ]
+
+            # Diagnostic outputs
+            diagnostics = results.get('diagnostics', {})
+            for cmd, output in diagnostics.items():
+                if not isinstance(output, str):
+                    # Structured (TextFSM) output - render as JSON
+                    output = json.dumps(output, indent=2)
+                parts.extend([
+                    f"\n{'#' * 60}\n",
+                    f"# Command: {cmd}\n",
+                    f"{'#' * 60}\n\n",
+                    output,
+                    "\n\n",
+                ])
+
+            # Encode once and write raw bytes - skips the incremental
+            # text-mode codec on multi-megabyte outputs
+            data = ''.join(parts).encode('utf-8', 'replace')
+            with open(filename, 'wb') as f:
+                f.write(data)
+
+            logger.info("Report saved to: %s", filename)
+
         except Exception as e:
-            print(f"Error generating report: {str(e)}")
+            logger.error("Error generating report: %s", e)
     
     def save_json(self, results: Dict, filename: str = None):
         """
@@ -244,32 +705,100 @@ class CiscoTroubleshooter:
             filename: Output filename
         """
         if not filename:
-            timestamp = datetime.datetime.now().strftime(TIMESTAMP_FORMAT)
+            timestamp = results.get('timestamp') or \
+                datetime.datetime.now().strftime(TIMESTAMP_FORMAT)
             hostname = results.get('hostname', 'unknown')
             filename = f"cisco_report_{hostname}_{timestamp}.json"
             
         try:
-            with open(filename, 'w') as f:
-                json.dump(results, f, indent=2)
-            print(f"JSON report saved to: {filename}")
+            if orjson is not None:
+                encoded = orjson.dumps(results, option=orjson.OPT_INDENT_2)
+            else:
+                encoded = json.dumps(results, indent=2).encode('utf-8')
+            with open(filename, 'wb') as f:
+                f.write(encoded)
+            logger.info("JSON report saved to: %s", filename)
         except Exception as e:
-            print(f"Error saving JSON: {str(e)}")
+            logger.error("Error saving JSON: %s", e)
+
+
+def _run_device_diagnostics(device: Dict, commands: List[str] = None) -> Union[DiagnosticsResult, ErrorResult]:
+    """
+    Connect to a single device, run diagnostics, and disconnect
+
+    Args:
+        device: Device parameters (as accepted by CiscoTroubleshooter)
+        commands: List of commands to run (uses default if None)
+
+    Returns:
+        DiagnosticsResult: Diagnostic results for the device (an
+        ErrorResult if it cannot be reached)
+    """
+    ts = CiscoTroubleshooter(**device)
+    if not ts.connect():
+        return {'device': device['ip'], 'error': 'Failed to connect to device'}
+    try:
+        return ts.run_diagnostics(commands)
+    finally:
+        ts.disconnect()
+
+
+async def run_diagnostics_async(devices: List[Dict], commands: List[str] = None,
+                                max_concurrent: int = MAX_CONCURRENT_DEVICES) -> List:
+    """
+    Run diagnostics on multiple devices concurrently
+
+    Each device still uses the blocking Netmiko connection, but connections
+    are dispatched in parallel threads so N devices take roughly the time
+    of the slowest one instead of the sum of all of them.
+
+    Args:
+        devices: List of device parameter dicts
+        commands: List of commands to run (uses default if None)
+        max_concurrent: Maximum number of simultaneous connections
+
+    Returns:
+        list: Per-device results in input order (exceptions included in place)
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def run_one(device: Dict):
+        async with semaphore:
+            return await asyncio.to_thread(_run_device_diagnostics, device, commands)
+
+    tasks = [asyncio.create_task(run_one(device)) for device in devices]
+    return await asyncio.gather(*tasks, return_exceptions=True)
 
 
 def main():
-    """Example usage of the troubleshooter"""
-    # This is just an example - real credentials should come from config or args
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(
+        description='Automated diagnostics and troubleshooting for Cisco devices')
+    parser.add_argument('--ip', required=True, help='Device IP address')
+    parser.add_argument('--user', required=True, help='Login username')
+    parser.add_argument('--password-env', default='CISCO_PASS',
+                        help='Environment variable holding the login password '
+                             '(default: CISCO_PASS)')
+    parser.add_argument('--device-type', default=DEFAULT_DEVICE_TYPE,
+                        help=f'Netmiko device type (default: {DEFAULT_DEVICE_TYPE})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f'SSH port (default: {DEFAULT_PORT})')
+    args = parser.parse_args()
+
+    # Credentials come from the environment rather than a prompt, so the
+    # tool can run non-interactively (cron, CI, xargs -P fan-out)
+    password = os.environ.get(args.password_env)
+    if not password:
+        parser.error(f"environment variable {args.password_env} is not set")
+
+    configure_logging()
     print("Cisco Troubleshooting Toolkit")
     print("-" * 30)
-    
-    # Example usage (replace with actual device info)
-    ip = input("Enter device IP: ")
-    username = input("Enter username: ")
-    password = input("Enter password: ")
-    
+
     # Create troubleshooter instance
-    ts = CiscoTroubleshooter(ip, username, password)
-    
+    ts = CiscoTroubleshooter(args.ip, args.user, password,
+                             device_type=args.device_type, port=args.port)
+
     # Connect to device
     if ts.connect():
         # Run diagnostics
@@ -291,6 +820,7 @@ def main():
         ts.disconnect()
     else:
         print("Failed to establish connection")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -7,6 +7,7 @@ Copy this file to config.py and update with your settings
 DEFAULT_DEVICE_TYPE = 'cisco_ios'
 DEFAULT_TIMEOUT = 30
 DEFAULT_PORT = 22
+FAST_CLI_DEFAULT = True  # Set to False for very slow devices or links
 
 # Diagnostic commands to run
 DIAGNOSTIC_COMMANDS = [
@@ -3,7 +3,10 @@
 Example usage of the Cisco Troubleshooting Toolkit
 """
 
-from cisco_troubleshooter import CiscoTroubleshooter
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from cisco_troubleshooter import CiscoTroubleshooter, run_diagnostics_async
 
 # Example 1: Basic health check
 def basic_health_check():
@@ -39,28 +42,64 @@ def custom_diagnostics():
 
 # Example 3: Multiple devices
 def multiple_devices():
-    """Check multiple devices and generate individual reports"""
+    """Check multiple devices concurrently and generate individual reports"""
     devices = [
         {'ip': '192.168.1.1', 'username': 'admin', 'password': 'pass1'},
         {'ip': '192.168.1.2', 'username': 'admin', 'password': 'pass2'},
         {'ip': '192.168.1.3', 'username': 'admin', 'password': 'pass3'},
     ]
-    
-    for device in devices:
-        print(f"\nChecking device: {device['ip']}")
+
+    # Devices are checked in parallel, so the whole batch takes roughly
+    # as long as the slowest device instead of the sum of all of them
+    all_results = asyncio.run(run_diagnostics_async(devices))
+
+    for device, results in zip(devices, all_results):
+        if isinstance(results, Exception) or 'error' in results:
+            print(f"Skipping {device['ip']} - connection failed")
+            continue
+
+        # Save report with device-specific name
+        report_name = f"report_{device['ip'].replace('.', '_')}.txt"
+        CiscoTroubleshooter(**device).generate_report(results, report_name)
+
+
+# Example 4: Multiple devices with a thread pool
+def multiple_devices_threadpool():
+    """Check multiple devices in parallel using a bounded thread pool
+
+    Same speedup as the asyncio example, but stays entirely on the
+    blocking Netmiko API - handy when the surrounding code is not async.
+    """
+    devices = [
+        {'ip': '192.168.1.1', 'username': 'admin', 'password': 'pass1'},
+        {'ip': '192.168.1.2', 'username': 'admin', 'password': 'pass2'},
+        {'ip': '192.168.1.3', 'username': 'admin', 'password': 'pass3'},
+    ]
+
+    def process_one(device):
+        """Connect, run diagnostics, and write a report for one device"""
         ts = CiscoTroubleshooter(**device)
-        
-        if ts.connect():
-            # Run diagnostics
+        if not ts.connect():
+            raise ConnectionError(f"connection failed for {device['ip']}")
+        try:
             results = ts.run_diagnostics()
-            
-            # Save report with device-specific name
             report_name = f"report_{device['ip'].replace('.', '_')}.txt"
             ts.generate_report(results, report_name)
-            
+            return report_name
+        finally:
             ts.disconnect()
-        else:
-            print(f"Skipping {device['ip']} - connection failed")
+
+    # Each worker owns its own troubleshooter and report file, so there is
+    # no shared mutable state between threads
+    with ThreadPoolExecutor(max_workers=min(16, len(devices))) as executor:
+        futures = {executor.submit(process_one, d): d for d in devices}
+        for future in as_completed(futures):
+            device = futures[future]
+            try:
+                report_name = future.result()
+                print(f"{device['ip']}: report saved to {report_name}")
+            except Exception as e:
+                print(f"Skipping {device['ip']} - {e}")
 
 
 if __name__ == "__main__":
@@ -68,4 +107,5 @@ if __name__ == "__main__":
     # basic_health_check()
     # custom_diagnostics()
     # multiple_devices()
+    # multiple_devices_threadpool()
     pass
\ No newline at end of file